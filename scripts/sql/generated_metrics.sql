@@ -0,0 +1,67 @@
+-- Derived ratio columns computed by Postgres instead of the ETL.
+--
+-- The ETL (scripts/sync_google_ads.py) no longer sends cpa / roas /
+-- conv_rate; they are STORED generated columns over the base metrics, so
+-- they can never drift from spend / conversions / clicks. Apply once, in the
+-- Supabase SQL editor, before deploying the ETL version that drops them from
+-- its payload (Postgres rejects explicit writes to generated columns).
+--
+-- Dividing by zero yields 0, as the ETL's former _div() helper did.
+
+BEGIN;
+
+ALTER TABLE campaigns
+    DROP COLUMN IF EXISTS cpa,
+    DROP COLUMN IF EXISTS roas,
+    DROP COLUMN IF EXISTS conv_rate,
+    ADD COLUMN cpa double precision GENERATED ALWAYS AS
+        (CASE WHEN conversions <> 0 THEN spend::double precision / conversions ELSE 0 END) STORED,
+    ADD COLUMN roas double precision GENERATED ALWAYS AS
+        (CASE WHEN spend <> 0 THEN conversion_value::double precision / spend ELSE 0 END) STORED,
+    ADD COLUMN conv_rate double precision GENERATED ALWAYS AS
+        (CASE WHEN clicks <> 0 THEN conversions::double precision / clicks ELSE 0 END) STORED;
+
+ALTER TABLE keywords
+    DROP COLUMN IF EXISTS cpa,
+    DROP COLUMN IF EXISTS roas,
+    DROP COLUMN IF EXISTS conv_rate,
+    ADD COLUMN cpa double precision GENERATED ALWAYS AS
+        (CASE WHEN conversions <> 0 THEN spend::double precision / conversions ELSE 0 END) STORED,
+    ADD COLUMN roas double precision GENERATED ALWAYS AS
+        (CASE WHEN spend <> 0 THEN conversion_value::double precision / spend ELSE 0 END) STORED,
+    ADD COLUMN conv_rate double precision GENERATED ALWAYS AS
+        (CASE WHEN clicks <> 0 THEN conversions::double precision / clicks ELSE 0 END) STORED;
+
+ALTER TABLE geo_performance
+    DROP COLUMN IF EXISTS cpa,
+    DROP COLUMN IF EXISTS roas,
+    DROP COLUMN IF EXISTS conv_rate,
+    ADD COLUMN cpa double precision GENERATED ALWAYS AS
+        (CASE WHEN conversions <> 0 THEN spend::double precision / conversions ELSE 0 END) STORED,
+    ADD COLUMN roas double precision GENERATED ALWAYS AS
+        (CASE WHEN spend <> 0 THEN conversion_value::double precision / spend ELSE 0 END) STORED,
+    ADD COLUMN conv_rate double precision GENERATED ALWAYS AS
+        (CASE WHEN clicks <> 0 THEN conversions::double precision / clicks ELSE 0 END) STORED;
+
+ALTER TABLE device_performance
+    DROP COLUMN IF EXISTS cpa,
+    DROP COLUMN IF EXISTS roas,
+    DROP COLUMN IF EXISTS conv_rate,
+    ADD COLUMN cpa double precision GENERATED ALWAYS AS
+        (CASE WHEN conversions <> 0 THEN spend::double precision / conversions ELSE 0 END) STORED,
+    ADD COLUMN roas double precision GENERATED ALWAYS AS
+        (CASE WHEN spend <> 0 THEN conversion_value::double precision / spend ELSE 0 END) STORED,
+    ADD COLUMN conv_rate double precision GENERATED ALWAYS AS
+        (CASE WHEN clicks <> 0 THEN conversions::double precision / clicks ELSE 0 END) STORED;
+
+ALTER TABLE ads
+    DROP COLUMN IF EXISTS cpa,
+    ADD COLUMN cpa double precision GENERATED ALWAYS AS
+        (CASE WHEN conversions <> 0 THEN spend::double precision / conversions ELSE 0 END) STORED;
+
+ALTER TABLE search_terms
+    DROP COLUMN IF EXISTS cpa,
+    ADD COLUMN cpa double precision GENERATED ALWAYS AS
+        (CASE WHEN conversions <> 0 THEN spend::double precision / conversions ELSE 0 END) STORED;
+
+COMMIT;
@@ -15,20 +15,67 @@ Required env vars:
     GOOGLE_ADS_DEVELOPER_TOKEN, GOOGLE_ADS_CLIENT_ID, GOOGLE_ADS_CLIENT_SECRET,
     GOOGLE_ADS_REFRESH_TOKEN, GOOGLE_ADS_CUSTOMER_ID,
     SUPABASE_URL, SUPABASE_SERVICE_KEY
+
+Optional env vars:
+    SUPABASE_DB_URL — direct Postgres connection string; enables COPY-based
+    bulk loading instead of PostgREST upserts
+    ETL_ID_HASH — row ID hash: "sha256" (default), "blake2b" or "xxh3"
+    ETL_GAQL_CONCURRENCY — reports fetched at once (default 4); also caps
+    direct Postgres connections
 """
 
 import os
 import sys
 import hashlib
+import functools
 import logging
+import operator
+import queue
 import argparse
+import atexit
+import contextlib
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator, KeysView
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
+from pathlib import Path
 from statistics import median as _median
 from typing import Any
 
+import grpc
+import httpx
 from google.ads.googleads.client import GoogleAdsClient
+from google.ads.googleads.errors import GoogleAdsException
 from supabase import create_client, Client
 
+try:
+    import psycopg
+    from psycopg import sql
+    from psycopg.types.json import Jsonb
+except ImportError:
+    psycopg = None  # direct Postgres loading disabled; PostgREST only
+
+try:
+    from psycopg_pool import ConnectionPool
+except ImportError:
+    ConnectionPool = None  # one connection per table instead of a shared pool
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # upsert payloads fall back to stdlib json
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None  # ETL_ID_HASH=xxh3 unavailable
+
 try:
     from dotenv import load_dotenv
 
@@ -53,13 +100,69 @@ SUPABASE_URL = (
     or os.environ.get("NEXT_PUBLIC_SUPABASE_URL", "")
 )
 SUPABASE_SERVICE_KEY = os.environ.get("SUPABASE_SERVICE_KEY", "")
+# Optional direct Postgres connection string (Supabase session pooler, port
+# 5432). When set, upserts bulk-load via COPY instead of PostgREST.
+SUPABASE_DB_URL = os.environ.get("SUPABASE_DB_URL", "")
 BATCH_SIZE = 500
+COPY_BATCH_SIZE = 10_000
+# COPY batches built ahead while the previous one is merged.
+COPY_PREFETCH_BATCHES = 2
+# PostgREST rows per request, by table. Per-request overhead dominates, so
+# narrow tables go bigger; ads carry every headline/description and stay
+# smaller. Anything unlisted uses BATCH_SIZE.
+BATCH_SIZES: dict[str, int] = {
+    "campaigns": 1000,
+    "geo_performance": 1000,
+    "device_performance": 1000,
+    "hourly_performance": 1000,
+    "auction_insights": 1000,
+    "quality_score_snapshots": 1000,
+    "conversion_actions": 1000,
+    "ads": 200,
+}
+# Chunks whose JSON body exceeds this are split before sending, keeping
+# well under the API gateway's request size limit.
+UPSERT_MAX_BODY_BYTES = 4 * 1024 * 1024
+
+# Report fetches run concurrently; keep well under the per-customer
+# request rate so a full sync doesn't trip RESOURCE_EXHAUSTED. Threads are
+# enough here: workers spend their time blocked on gRPC/HTTP, not the GIL.
+# The same cap sizes the direct Postgres connection pool.
+_gaql_concurrency = os.environ.get("ETL_GAQL_CONCURRENCY", "").strip() or "4"
+if not _gaql_concurrency.isdigit() or int(_gaql_concurrency) < 1:
+    raise SystemExit(f"ETL_GAQL_CONCURRENCY must be a positive integer, got {_gaql_concurrency!r}")
+GAQL_CONCURRENCY = int(_gaql_concurrency)
+GAQL_MAX_ATTEMPTS = 5
+GAQL_RETRY_BASE_SECONDS = 2.0
+_GAQL_RETRYABLE = {"RESOURCE_EXHAUSTED", "INTERNAL", "UNAVAILABLE", "DEADLINE_EXCEEDED"}
+
+# PostgREST requests in flight across all tables at once, and per table.
+# Stay well below the Supabase connection pool (15 on the smaller plans).
+UPSERT_CONCURRENCY = 4
+UPSERT_CHUNKS_PER_TABLE = 3
+UPSERT_MAX_ATTEMPTS = 4
+UPSERT_RETRY_BASE_SECONDS = 1.0
+_UPSERT_RETRYABLE = {429, 500, 502, 503, 504}
+
+# Geo target constants (state IDs → names) never change, so lookups are
+# persisted between runs. Safe to delete; it is rebuilt on demand.
+GEO_CACHE_PATH = Path(__file__).resolve().parent / ".cache" / "geo_targets.json"
+GEO_LOOKUP_CHUNK_SIZE = 1000
+
+# Hash behind _make_id. SHA-256 matches the IDs already stored; blake2b
+# (stdlib) and xxh3 are cheaper but yield different IDs, so only switch for
+# a fresh backfill.
+ID_HASH = os.environ.get("ETL_ID_HASH", "sha256").strip().lower()
 
 # ---------------------------------------------------------------------------
 # Client factories
+#
+# One instance of each per process: both are safe to share across the
+# fetch/upsert threads, and reuse keeps a single gRPC channel / HTTP pool.
 # ---------------------------------------------------------------------------
 
 
+@functools.lru_cache(maxsize=1)
 def _ga_client() -> GoogleAdsClient:
     return GoogleAdsClient.load_from_dict(
         {
@@ -67,11 +170,12 @@ def _ga_client() -> GoogleAdsClient:
             "client_id": os.environ["GOOGLE_ADS_CLIENT_ID"],
             "client_secret": os.environ["GOOGLE_ADS_CLIENT_SECRET"],
             "refresh_token": os.environ["GOOGLE_ADS_REFRESH_TOKEN"],
-            "use_proto_plus": True,
+            "use_proto_plus": False,
         }
     )
 
 
+@functools.lru_cache(maxsize=1)
 def _supa_client() -> Client:
     return create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
 
@@ -82,7 +186,11 @@ def _supa_client() -> Client:
 
 
 def _micros(val: Any) -> float:
-    """Google Ads cost fields are in micros (1/1,000,000 of currency unit)."""
+    """Google Ads cost fields are in micros (1/1,000,000 of currency unit).
+
+    Truncates to whole micros first: metrics.average_cpc is a double, and
+    stored cpc values have always been whole-micro amounts.
+    """
     return int(val or 0) / 1_000_000
 
 
@@ -90,63 +198,125 @@ def _div(numerator: float, denominator: float) -> float:
     return numerator / denominator if denominator else 0.0
 
 
+_ID_HASHERS = {
+    "sha256": lambda raw: hashlib.sha256(raw).hexdigest(),
+    # 8-byte digest → exactly the 16 hex chars kept, nothing wasted.
+    "blake2b": lambda raw: hashlib.blake2b(raw, digest_size=8).hexdigest(),
+}
+if xxhash is not None:
+    _ID_HASHERS["xxh3"] = xxhash.xxh3_128_hexdigest
+# No fallback: rows already keyed by another hash would be written again
+# under new IDs that upserts never match.
+if ID_HASH not in _ID_HASHERS:
+    raise SystemExit(
+        f"ETL_ID_HASH={ID_HASH!r} is unavailable (choose from {', '.join(sorted(_ID_HASHERS))};"
+        " xxh3 requires the xxhash package)"
+    )
+_id_hexdigest = _ID_HASHERS[ID_HASH]
+
+
 def _make_id(*parts: Any) -> str:
     """Deterministic 16-char hex hash from composite key parts."""
     raw = "|".join(str(p) for p in parts)
-    return hashlib.sha256(raw.encode()).hexdigest()[:16]
+    return _id_hexdigest(raw.encode())[:16]
+
+
+# (message type, field) → {enum number: name}, filled on first use.
+_enum_names: dict[tuple[str, str], dict[int, str]] = {}
 
 
-def _ename(val: Any) -> str:
-    """Proto-plus enum → uppercase string name."""
-    return val.name if hasattr(val, "name") else str(val)
+def _field_enum_names(desc: Any, field: str) -> dict[int, str]:
+    key = (desc.full_name, field)
+    names = _enum_names.get(key)
+    if names is None:
+        enum_type = desc.fields_by_name[field].enum_type
+        names = _enum_names[key] = {v.number: v.name for v in enum_type.values}
+    return names
+
+
+def _ename(msg: Any, field: str) -> str:
+    """Raw protobuf enum field → uppercase string name (e.g. "ENABLED")."""
+    val = getattr(msg, field)
+    return _field_enum_names(msg.DESCRIPTOR, field).get(val, str(val))
 
 
 def _med(vals: list[float]) -> float:
     return _median(vals) if vals else 0.0
 
 
+class _StrMemo(dict):
+    """Per-report ``str()`` memo for ids, names and dates.
+
+    A report repeats the same few campaigns, ad groups and dates on every
+    row; memoising returns one shared string per value instead of a fresh
+    copy per row, so buffered records share their repeated fields.
+    """
+
+    def __missing__(self, key: Any) -> str:
+        val = self[key] = str(key)
+        return val
+
+
+def _chunked(items: Iterable, size: int) -> Iterator[list]:
+    """Yield successive lists of at most ``size`` items."""
+    it = iter(items)
+    while chunk := list(itertools.islice(it, size)):
+        yield chunk
+
+
 # ---------------------------------------------------------------------------
 # Campaign name → Product / Intent Bucket
 # (mirrors TypeScript inferProduct / inferIntentBucket in google-ads-csv.ts)
+#
+# Called for every row but only ever sees the account's few dozen campaign
+# names, so results are memoised per name.
 # ---------------------------------------------------------------------------
 
 
+def _any_of(*keywords: str) -> re.Pattern[str]:
+    """One compiled alternation, so each keyword list is a single scan."""
+    return re.compile("|".join(re.escape(k) for k in keywords))
+
+
+# Rules are checked in order (first match wins), mirroring the precedence of
+# the TypeScript helpers — a single combined regex would instead pick
+# whichever keyword happens to appear first in the name.
+_PRODUCT_RULES: tuple[tuple[re.Pattern[str], str], ...] = (
+    (_any_of("termlife", "term life", "term-life", "life insurance"), "Term Life"),
+    (_any_of("dental"), "Dental Network"),
+    (_any_of("disability", "idi"), "Disability"),
+    (_any_of("annuity", "annuities", "rila", "retirement"), "Annuities"),
+    (_any_of("recruit", "credential", "join", "provider"), "Join Our Network"),
+)
+
+_NONBRAND_RE = _any_of("nonbrand", "non-brand", "nonbranded", "non-branded")
+_BRANDED_RE = _any_of("-brand-", "-branded")
+_INTENT_RULES: tuple[tuple[re.Pattern[str], str], ...] = (
+    (_any_of("group", "employer", "worksite", "abm-"), "Group"),
+    (_any_of("leadgen", "conversion", "quote", "quotes"), "Nonbrand Lead Gen"),
+    (_any_of("midfunnel", "education", "alwayson", "traffic", "awareness"), "Education/Midfunnel"),
+)
+
+
+@functools.lru_cache(maxsize=4096)
 def infer_product(text: str) -> str:
     t = (text or "").lower()
-    if any(k in t for k in ("termlife", "term life", "term-life", "life insurance")):
-        return "Term Life"
-    if "dental" in t:
-        return "Dental Network"
-    if any(k in t for k in ("disability", "idi")):
-        return "Disability"
-    if any(k in t for k in ("annuity", "annuities", "rila", "retirement")):
-        return "Annuities"
-    if any(k in t for k in ("recruit", "credential", "join", "provider")):
-        return "Join Our Network"
+    for pattern, product in _PRODUCT_RULES:
+        if pattern.search(t):
+            return product
     return "Other"
 
 
+@functools.lru_cache(maxsize=4096)
 def infer_intent_bucket(text: str) -> str:
     t = (text or "").lower()
-    has_nonbrand = any(
-        k in t
-        for k in (
-            "nonbrand",
-            "non-brand",
-            "nonbranded",
-            "non-branded",
-        )
-    )
-    if "google_brand" in t or t.startswith("google_brand"):
+    if "google_brand" in t:
         return "Brand"
-    if not has_nonbrand and ("-brand-" in t or "-branded" in t or t.endswith("-branded")):
+    if _BRANDED_RE.search(t) and not _NONBRAND_RE.search(t):
         return "Brand"
-    if any(k in t for k in ("group", "employer", "worksite", "abm-")):
-        return "Group"
-    if any(k in t for k in ("leadgen", "conversion", "quote", "quotes")):
-        return "Nonbrand Lead Gen"
-    if any(k in t for k in ("midfunnel", "education", "alwayson", "traffic", "awareness")):
-        return "Education/Midfunnel"
+    for pattern, bucket in _INTENT_RULES:
+        if pattern.search(t):
+            return bucket
     return "Education/Midfunnel"
 
 
@@ -250,14 +420,30 @@ _US_STATE_CODE_BY_NAME = {
 }
 
 
-def _lookup(table: dict, val: Any, fallback: str = "") -> str:
-    return table.get(_ename(val), fallback)
+# (table, message type, field) → {enum number: label}. Built on first use so
+# the per-row lookup is a single dict hit on the raw enum number.
+_enum_labels: dict[tuple[int, str, str], dict[int, str]] = {}
+
+
+def _lookup(table: dict, msg: Any, field: str, fallback: str = "") -> str:
+    desc = msg.DESCRIPTOR
+    key = (id(table), desc.full_name, field)
+    labels = _enum_labels.get(key)
+    if labels is None:
+        names = _field_enum_names(desc, field)
+        labels = _enum_labels[key] = {
+            num: table[name] for num, name in names.items() if name in table
+        }
+    return labels.get(getattr(msg, field), fallback)
 
 
 # ---------------------------------------------------------------------------
 # GAQL queries  ({date_condition} is injected at runtime)
 # ---------------------------------------------------------------------------
 
+# Each SELECT lists only the fields its transform reads; WHERE-only fields
+# (channel type, metric thresholds) are filtered server-side without being
+# returned.
 GAQL: dict[str, str] = {}
 
 GAQL["campaigns"] = """
@@ -331,7 +517,6 @@ GAQL["ads"] = """
 GAQL["geo_performance"] = """
     SELECT
         campaign.id,
-        campaign.advertising_channel_type,
         segments.geo_target_region,
         geographic_view.country_criterion_id,
         geographic_view.location_type,
@@ -375,7 +560,7 @@ GAQL["hourly_performance"] = """
 # For full competitor breakdowns, extend with the AuctionInsightService.
 GAQL["auction_insights"] = """
     SELECT
-        campaign.id, campaign.name,
+        campaign.id,
         metrics.search_impression_share,
         metrics.search_top_impression_share,
         metrics.search_absolute_top_impression_share,
@@ -418,11 +603,9 @@ GAQL["conversion_actions"] = """
 
 GAQL["landing_pages"] = """
     SELECT
-        campaign.advertising_channel_type,
         landing_page_view.unexpanded_final_url,
-        metrics.clicks, metrics.impressions,
+        metrics.clicks,
         metrics.conversions, metrics.conversions_value,
-        metrics.cost_micros,
         segments.date
     FROM landing_page_view
     WHERE {date_condition}
@@ -431,399 +614,582 @@ GAQL["landing_pages"] = """
 """
 
 # ---------------------------------------------------------------------------
-# Transform functions  (Google Ads API rows → Supabase-ready dicts)
+# Column schemas  (tuple order emitted by each transform → Supabase columns)
+# Every schema starts with ("id", "date"), the upsert conflict key.
+# Derived ratios (cpa, roas, conv_rate) are generated columns computed by
+# Postgres — see scripts/sql/generated_metrics.sql — and are never sent.
+# ---------------------------------------------------------------------------
+
+SCHEMA: dict[str, tuple[str, ...]] = {}
+
+SCHEMA["campaigns"] = (
+    "id", "date", "campaign_name", "product", "intent_bucket", "status",
+    "spend", "impressions", "clicks", "conversions", "conversion_value",
+    "ctr", "cpc",
+    "search_impression_share", "lost_is_budget", "lost_is_rank",
+)
+
+SCHEMA["keywords"] = (
+    "id", "date", "keyword", "match_type",
+    "campaign_id", "campaign_name", "ad_group_id", "ad_group_name",
+    "quality_score", "expected_ctr", "ad_relevance", "landing_page_experience",
+    "spend", "impressions", "clicks", "conversions", "conversion_value",
+    "ctr", "cpc",
+)
+
+SCHEMA["search_terms"] = (
+    "id", "date", "search_term",
+    "campaign_id", "campaign_name", "ad_group_id", "ad_group_name",
+    "match_type", "label", "reason",
+    "spend", "impressions", "clicks", "conversions", "conversion_value",
+    "ctr",
+)
+
+SCHEMA["ads"] = (
+    "id", "date", "campaign_id", "campaign_name", "ad_group_id", "ad_group_name",
+    "headlines", "descriptions", "ad_strength",
+    "spend", "impressions", "clicks", "conversions", "conversion_value",
+    "ctr", "cpc",
+)
+
+SCHEMA["geo_performance"] = (
+    "id", "date", "campaign_id", "state", "state_code", "dma",
+    "spend", "impressions", "clicks", "conversions", "conversion_value",
+    "ctr", "cpc",
+)
+
+SCHEMA["device_performance"] = (
+    "id", "date", "campaign_id", "device",
+    "spend", "impressions", "clicks", "conversions", "conversion_value",
+    "ctr", "cpc",
+)
+
+SCHEMA["hourly_performance"] = (
+    "id", "date", "campaign_id", "hour", "day_of_week",
+    "spend", "impressions", "clicks", "conversions", "conversion_value",
+)
+
+SCHEMA["auction_insights"] = (
+    "id", "date", "campaign_id", "competitor", "impression_share",
+    "overlap_rate", "position_above_rate", "top_of_page_rate", "outranking_share",
+)
+
+SCHEMA["quality_score_snapshots"] = (
+    "id", "date", "keyword_id", "keyword", "campaign_id", "product",
+    "quality_score", "expected_ctr", "ad_relevance", "landing_page_experience",
+    "spend",
+)
+
+SCHEMA["conversion_actions"] = (
+    "id", "date", "campaign_id", "product", "conversion_type",
+    "conversions", "conversion_value", "attribution",
+)
+
+SCHEMA["landing_pages"] = (
+    "id", "date", "url", "sessions", "bounce_rate", "conversion_rate",
+    "conversions", "conversion_value", "mobile_conv_rate", "desktop_conv_rate",
+)
+
+# ---------------------------------------------------------------------------
+# Transform functions  (Google Ads API rows → tuples in SCHEMA column order)
+#
+# Kept as plain Python on purpose: the script runs straight from a checkout
+# with no build step, and with raw protobuf rows each field read is already
+# a C call. Keep the loops flat — one attrgetter call per row, no per-row
+# helper objects — rather than reaching for a compiled extension.
 # ---------------------------------------------------------------------------
 
 
-def _xf_campaigns(rows: list) -> list[dict]:
-    out: list[dict] = []
+# Metric paths read by most reports, in the order the transforms unpack them.
+_CORE_METRICS = (
+    "metrics.cost_micros", "metrics.impressions", "metrics.clicks",
+    "metrics.conversions", "metrics.conversions_value",
+    "metrics.ctr", "metrics.average_cpc",
+)
+
+# Each report reads its fields through one attrgetter, so a row is unpacked
+# in a single C call instead of a chain of attribute loads.
+_CAMPAIGN_ROW = operator.attrgetter(
+    "campaign", "campaign.id", "campaign.name", "segments.date",
+    *_CORE_METRICS,
+    "metrics.search_impression_share",
+    "metrics.search_budget_lost_impression_share",
+    "metrics.search_rank_lost_impression_share",
+)
+
+
+def _xf_campaigns(rows: Iterable) -> Iterator[tuple]:
+    strs = _StrMemo()
     for r in rows:
-        spend = _micros(r.metrics.cost_micros)
-        convs = float(r.metrics.conversions)
-        conv_val = float(r.metrics.conversions_value)
-        clicks = int(r.metrics.clicks)
-        out.append(
-            {
-                "id": str(r.campaign.id),
-                "date": str(r.segments.date),
-                "campaign_name": str(r.campaign.name),
-                "product": infer_product(r.campaign.name),
-                "intent_bucket": infer_intent_bucket(r.campaign.name),
-                "status": _STATUS_MAP.get(_ename(r.campaign.status), "paused"),
-                "spend": spend,
-                "impressions": int(r.metrics.impressions),
-                "clicks": clicks,
-                "conversions": convs,
-                "conversion_value": conv_val,
-                "ctr": float(r.metrics.ctr),
-                "cpc": _micros(r.metrics.average_cpc),
-                "cpa": _div(spend, convs),
-                "roas": _div(conv_val, spend),
-                "conv_rate": _div(convs, clicks),
-                "search_impression_share": float(r.metrics.search_impression_share or 0),
-                "lost_is_budget": float(r.metrics.search_budget_lost_impression_share or 0),
-                "lost_is_rank": float(r.metrics.search_rank_lost_impression_share or 0),
-            }
+        (
+            c, cid, name, date,
+            cost, impressions, clicks, convs, conv_val, ctr, cpc,
+            imp_share, lost_budget, lost_rank,
+        ) = _CAMPAIGN_ROW(r)
+        name = strs[name]
+        yield (
+            strs[cid],
+            strs[date],
+            name,
+            infer_product(name),
+            infer_intent_bucket(name),
+            _lookup(_STATUS_MAP, c, "status", "paused"),
+            _micros(cost),
+            int(impressions),
+            int(clicks),
+            float(convs),
+            float(conv_val),
+            float(ctr),
+            _micros(cpc),
+            float(imp_share or 0),
+            float(lost_budget or 0),
+            float(lost_rank or 0),
         )
-    return out
 
 
-def _xf_keywords(rows: list) -> list[dict]:
-    out: list[dict] = []
+_KEYWORD_ROW = operator.attrgetter(
+    "ad_group_criterion.criterion_id", "ad_group_criterion.keyword",
+    "ad_group_criterion.quality_info",
+    "campaign.id", "campaign.name", "ad_group.id", "ad_group.name", "segments.date",
+    *_CORE_METRICS,
+)
+
+
+def _xf_keywords(rows: Iterable) -> Iterator[tuple]:
+    strs = _StrMemo()
     for r in rows:
-        spend = _micros(r.metrics.cost_micros)
-        convs = float(r.metrics.conversions)
-        clicks = int(r.metrics.clicks)
-        out.append(
-            {
-                "id": str(r.ad_group_criterion.criterion_id),
-                "date": str(r.segments.date),
-                "keyword": str(r.ad_group_criterion.keyword.text),
-                "match_type": _lookup(_MATCH_MAP, r.ad_group_criterion.keyword.match_type, "Broad"),
-                "campaign_id": str(r.campaign.id),
-                "campaign_name": str(r.campaign.name),
-                "ad_group_id": str(r.ad_group.id),
-                "ad_group_name": str(r.ad_group.name),
-                "quality_score": int(r.ad_group_criterion.quality_info.quality_score or 0) or None,
-                "expected_ctr": _lookup(
-                    _QS_RATING, r.ad_group_criterion.quality_info.search_predicted_ctr
-                ),
-                "ad_relevance": _lookup(
-                    _QS_RATING, r.ad_group_criterion.quality_info.creative_quality_score
-                ),
-                "landing_page_experience": _lookup(
-                    _QS_RATING, r.ad_group_criterion.quality_info.post_click_quality_score
-                ),
-                "spend": spend,
-                "impressions": int(r.metrics.impressions),
-                "clicks": clicks,
-                "conversions": convs,
-                "conversion_value": float(r.metrics.conversions_value),
-                "ctr": float(r.metrics.ctr),
-                "cpc": _micros(r.metrics.average_cpc),
-                "cpa": _div(spend, convs),
-                "roas": _div(float(r.metrics.conversions_value), spend),
-                "conv_rate": _div(convs, clicks),
-            }
+        (
+            criterion_id, kw, qi, cid, cname, ag_id, ag_name, date,
+            cost, impressions, clicks, convs, conv_val, ctr, cpc,
+        ) = _KEYWORD_ROW(r)
+        yield (
+            str(criterion_id),
+            strs[date],
+            str(kw.text),
+            _lookup(_MATCH_MAP, kw, "match_type", "Broad"),
+            strs[cid],
+            strs[cname],
+            strs[ag_id],
+            strs[ag_name],
+            int(qi.quality_score or 0) or None,
+            _lookup(_QS_RATING, qi, "search_predicted_ctr"),
+            _lookup(_QS_RATING, qi, "creative_quality_score"),
+            _lookup(_QS_RATING, qi, "post_click_quality_score"),
+            _micros(cost),
+            int(impressions),
+            int(clicks),
+            float(convs),
+            float(conv_val),
+            float(ctr),
+            _micros(cpc),
         )
-    return out
 
 
-def _xf_search_terms(rows: list) -> list[dict]:
-    # Two-pass: collect base data, compute median CPA, then classify.
-    base: list[tuple[float, float, float, Any]] = []
-    for r in rows:
-        spend = _micros(r.metrics.cost_micros)
-        convs = float(r.metrics.conversions)
-        cpa = _div(spend, convs)
-        base.append((spend, convs, cpa, r))
+_SEARCH_TERM_ROW = operator.attrgetter(
+    "search_term_view.search_term", "metrics.cost_micros", "metrics.conversions",
+    "campaign.id", "campaign.name", "ad_group.id", "ad_group.name",
+    "segments.keyword.info", "segments.date",
+    "metrics.impressions", "metrics.clicks", "metrics.conversions_value", "metrics.ctr",
+)
 
-    cpas = [cpa for _, convs, cpa, _ in base if convs > 0 and cpa > 0]
-    median_cpa = _med(cpas)
 
-    out: list[dict] = []
-    for spend, convs, cpa, r in base:
-        term = str(r.search_term_view.search_term)
+def _xf_search_terms(rows: Iterable) -> Iterator[tuple]:
+    # Two-pass: the label depends on the median CPA over every row, so
+    # unlike the other reports search terms are buffered before anything is
+    # yielded. The buffer holds each row's finished output values, not the
+    # protobuf row (and the arena behind it), so it stays small.
+    pending: list[tuple[float, tuple, tuple]] = []
+    cpas: list[float] = []
+    strs = _StrMemo()
+    for r in rows:
+        (
+            term, cost, convs, cid, cname, ag_id, ag_name, kw_info, date,
+            impressions, clicks, conv_val, ctr,
+        ) = _SEARCH_TERM_ROW(r)
+        spend = _micros(cost)
+        convs = float(convs)
+        cpa = _div(spend, convs)
+        if convs > 0 and cpa > 0:
+            cpas.append(cpa)
+        term = str(term)
         if not term:
             continue
-        label, reason = _classify_search_term(spend, convs, cpa, median_cpa)
-        out.append(
-            {
-                "id": _make_id(r.campaign.id, r.ad_group.id, term, _ename(r.segments.keyword.info.match_type)),
-                "date": str(r.segments.date),
-                "search_term": term,
-                "campaign_id": str(r.campaign.id),
-                "campaign_name": str(r.campaign.name),
-                "ad_group_id": str(r.ad_group.id),
-                "ad_group_name": str(r.ad_group.name),
-                "match_type": _lookup(_MATCH_MAP, r.segments.keyword.info.match_type, "Broad"),
-                "label": label,
-                "reason": reason,
-                "spend": spend,
-                "impressions": int(r.metrics.impressions),
-                "clicks": int(r.metrics.clicks),
-                "conversions": convs,
-                "conversion_value": float(r.metrics.conversions_value),
-                "cpa": cpa,
-                "ctr": float(r.metrics.ctr),
-            }
+        head = (
+            _make_id(cid, ag_id, term, _ename(kw_info, "match_type")),
+            strs[date],
+            term,
+            strs[cid],
+            strs[cname],
+            strs[ag_id],
+            strs[ag_name],
+            _lookup(_MATCH_MAP, kw_info, "match_type", "Broad"),
         )
-    return out
+        tail = (spend, int(impressions), int(clicks), convs, float(conv_val), float(ctr))
+        pending.append((cpa, head, tail))
+    median_cpa = _med(cpas)
+    for cpa, head, tail in pending:
+        label, reason = _classify_search_term(tail[0], tail[3], cpa, median_cpa)
+        yield (*head, label, reason, *tail)
+
+
+_AD_ROW = operator.attrgetter(
+    "ad_group_ad", "ad_group_ad.ad.id", "ad_group_ad.ad.responsive_search_ad",
+    "campaign.id", "campaign.name", "ad_group.id", "ad_group.name", "segments.date",
+    *_CORE_METRICS,
+)
 
 
-def _xf_ads(rows: list) -> list[dict]:
-    out: list[dict] = []
+def _xf_ads(rows: Iterable) -> Iterator[tuple]:
+    strs = _StrMemo()
     for r in rows:
-        spend = _micros(r.metrics.cost_micros)
-        headlines = [str(a.text) for a in (r.ad_group_ad.ad.responsive_search_ad.headlines or [])]
-        descriptions = [
-            str(a.text) for a in (r.ad_group_ad.ad.responsive_search_ad.descriptions or [])
-        ]
-        out.append(
-            {
-                "id": str(r.ad_group_ad.ad.id),
-                "date": str(r.segments.date),
-                "campaign_id": str(r.campaign.id),
-                "campaign_name": str(r.campaign.name),
-                "ad_group_id": str(r.ad_group.id),
-                "ad_group_name": str(r.ad_group.name),
-                "headlines": headlines,
-                "descriptions": descriptions,
-                "ad_strength": _ename(r.ad_group_ad.ad_strength),
-                "spend": spend,
-                "impressions": int(r.metrics.impressions),
-                "clicks": int(r.metrics.clicks),
-                "conversions": float(r.metrics.conversions),
-                "conversion_value": float(r.metrics.conversions_value),
-                "ctr": float(r.metrics.ctr),
-                "cpc": _micros(r.metrics.average_cpc),
-                "cpa": _div(spend, float(r.metrics.conversions)),
-            }
+        (
+            aga, ad_id, rsa, cid, cname, ag_id, ag_name, date,
+            cost, impressions, clicks, convs, conv_val, ctr, cpc,
+        ) = _AD_ROW(r)
+        yield (
+            str(ad_id),
+            strs[date],
+            strs[cid],
+            strs[cname],
+            strs[ag_id],
+            strs[ag_name],
+            [str(a.text) for a in (rsa.headlines or [])],
+            [str(a.text) for a in (rsa.descriptions or [])],
+            _ename(aga, "ad_strength"),
+            _micros(cost),
+            int(impressions),
+            int(clicks),
+            float(convs),
+            float(conv_val),
+            float(ctr),
+            _micros(cpc),
         )
-    return out
 
 
-def _xf_geo_performance(rows: list) -> list[dict]:
-    out: list[dict] = []
+_GEO_ROW = operator.attrgetter(
+    "campaign.id", "segments.date", "segments.geo_target_region", "geographic_view",
+    *_CORE_METRICS,
+)
+
+
+def _xf_geo_performance(rows: Iterable) -> Iterator[tuple]:
+    strs = _StrMemo()
     for r in rows:
-        spend = _micros(r.metrics.cost_micros)
-        convs = float(r.metrics.conversions)
-        clicks = int(r.metrics.clicks)
-        region_resource = str(r.segments.geo_target_region or "")
+        (
+            cid, date, region, gv,
+            cost, impressions, clicks, convs, conv_val, ctr, cpc,
+        ) = _GEO_ROW(r)
+        region_resource = str(region or "")
         criterion_id = (
             region_resource.split("/")[-1]
             if region_resource
-            else str(r.geographic_view.country_criterion_id or "")
+            else str(gv.country_criterion_id or "")
         )
-        out.append(
-            {
-                "id": _make_id(r.campaign.id, criterion_id or "unknown"),
-                "date": str(r.segments.date),
-                "campaign_id": str(r.campaign.id),
-                "state": criterion_id,
-                "state_code": criterion_id,
-                "dma": _ename(r.geographic_view.location_type),
-                "spend": spend,
-                "impressions": int(r.metrics.impressions),
-                "clicks": clicks,
-                "conversions": convs,
-                "conversion_value": float(r.metrics.conversions_value),
-                "ctr": float(r.metrics.ctr),
-                "cpc": _micros(r.metrics.average_cpc),
-                "cpa": _div(spend, convs),
-                "roas": _div(float(r.metrics.conversions_value), spend),
-                "conv_rate": _div(convs, clicks),
-            }
+        yield (
+            _make_id(cid, criterion_id or "unknown"),
+            strs[date],
+            strs[cid],
+            criterion_id,  # state — resolved by _enrich_geo_records
+            criterion_id,  # state_code
+            _ename(gv, "location_type"),
+            _micros(cost),
+            int(impressions),
+            int(clicks),
+            float(convs),
+            float(conv_val),
+            float(ctr),
+            _micros(cpc),
         )
-    return out
+
+
+_geo_cache: dict[str, dict[str, str]] | None = None
+_geo_cache_lock = threading.Lock()
+
+
+def _load_geo_cache() -> dict[str, dict[str, str]]:
+    try:
+        with GEO_CACHE_PATH.open() as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_geo_cache(cache: dict[str, dict[str, str]]) -> None:
+    try:
+        GEO_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp = GEO_CACHE_PATH.with_suffix(".tmp")
+        tmp.write_text(json.dumps(cache, indent=1, sort_keys=True))
+        tmp.replace(GEO_CACHE_PATH)
+    except OSError as exc:
+        log.warning("  could not write geo target cache %s: %s", GEO_CACHE_PATH, exc)
 
 
 def _geo_target_details(ga: GoogleAdsClient, criterion_ids: list[str]) -> dict[str, dict[str, str]]:
-    """Resolve geo target criterion IDs to names and metadata."""
+    """Resolve geo target criterion IDs to names and metadata.
+
+    Served from the process/on-disk cache where possible; only IDs never
+    seen before are queried, and the cache file is updated with them.
+    """
+    global _geo_cache
     if not criterion_ids:
         return {}
 
+    with _geo_cache_lock:
+        if _geo_cache is None:
+            _geo_cache = _load_geo_cache()
+        cache = _geo_cache
+        missing = [cid for cid in criterion_ids if cid not in cache]
+        if missing:
+            fetched = _fetch_geo_target_details(ga, missing)
+            # IDs Google doesn't return are cached as {} so they aren't
+            # re-queried on every run.
+            cache.update({cid: fetched.get(cid, {}) for cid in missing})
+            _save_geo_cache(cache)
+        return {cid: cache[cid] for cid in criterion_ids if cache.get(cid)}
+
+
+def _fetch_geo_target_details(
+    ga: GoogleAdsClient, criterion_ids: list[str]
+) -> dict[str, dict[str, str]]:
+    # One query per call: _enrich_geo_records passes at most
+    # GEO_LOOKUP_CHUNK_SIZE IDs, which keeps the IN clause bounded.
+    id_list = ", ".join(criterion_ids)
+    query = f"""
+        SELECT
+            geo_target_constant.id,
+            geo_target_constant.name,
+            geo_target_constant.canonical_name,
+            geo_target_constant.target_type,
+            geo_target_constant.country_code
+        FROM geo_target_constant
+        WHERE geo_target_constant.id IN ({id_list})
+    """
     resolved: dict[str, dict[str, str]] = {}
-    # Keep query size bounded and avoid giant IN clauses.
-    chunk_size = 200
-    for i in range(0, len(criterion_ids), chunk_size):
-        chunk = criterion_ids[i : i + chunk_size]
-        id_list = ", ".join(chunk)
-        query = f"""
-            SELECT
-                geo_target_constant.id,
-                geo_target_constant.name,
-                geo_target_constant.canonical_name,
-                geo_target_constant.target_type,
-                geo_target_constant.country_code
-            FROM geo_target_constant
-            WHERE geo_target_constant.id IN ({id_list})
-        """
-        rows = _run_gaql(ga, query)
-        for row in rows:
-            geo = row.geo_target_constant
-            cid = str(geo.id)
-            resolved[cid] = {
-                "name": str(geo.name),
-                "canonical_name": str(geo.canonical_name),
-                "target_type": _ename(geo.target_type),
-                "country_code": str(geo.country_code),
-            }
+    for row in _run_gaql(ga, query):
+        geo = row.geo_target_constant
+        resolved[str(geo.id)] = {
+            "name": str(geo.name),
+            "canonical_name": str(geo.canonical_name),
+            "target_type": str(geo.target_type),
+            "country_code": str(geo.country_code),
+        }
     return resolved
 
 
-def _enrich_geo_records(ga: GoogleAdsClient, records: list[dict]) -> list[dict]:
-    """Attach human-readable state names/codes to geo performance rows."""
-    criterion_ids = sorted(
-        {
-            str(r.get("state_code", "")).strip()
-            for r in records
-            if str(r.get("state_code", "")).strip().isdigit()
-        }
-    )
-    details = _geo_target_details(ga, criterion_ids)
+_GEO_STATE = SCHEMA["geo_performance"].index("state")
+_GEO_STATE_CODE = SCHEMA["geo_performance"].index("state_code")
+_GEO_DMA = SCHEMA["geo_performance"].index("dma")
 
-    for rec in records:
-        raw_id = str(rec.get("state_code", "")).strip()
-        info = details.get(raw_id)
-        if not info:
-            continue
 
-        name = info["name"]
-        country_code = info["country_code"]
-        target_type = info["target_type"]
-        canonical_name = info["canonical_name"]
-        if country_code == "US" and target_type in {"State", "Province"}:
-            rec["state"] = name
-            rec["state_code"] = _US_STATE_CODE_BY_NAME.get(name, raw_id)
-        else:
-            rec["state"] = canonical_name or name
-            rec["state_code"] = raw_id
+def _enrich_geo_records(ga: GoogleAdsClient, records: Iterable[tuple]) -> Iterator[tuple]:
+    """Attach human-readable state names/codes to geo performance rows.
+
+    Rows are buffered GEO_LOOKUP_CHUNK_SIZE at a time, so every batch
+    resolves its uncached IDs with at most one GAQL query.
+    """
+    details: dict[str, dict[str, str]] = {}
+    requested: set[str] = set()
+    for batch in _chunked(records, GEO_LOOKUP_CHUNK_SIZE):
+        # Only look up IDs not already requested for an earlier batch.
+        criterion_ids = sorted(
+            {cid for r in batch if (cid := str(r[_GEO_STATE_CODE]).strip()).isdigit()}
+            - requested
+        )
+        requested.update(criterion_ids)
+        details.update(_geo_target_details(ga, criterion_ids))
+        for rec in batch:
+            yield _apply_geo_details(rec, details)
+
+
+def _apply_geo_details(rec: tuple, details: dict[str, dict[str, str]]) -> tuple:
+    raw_id = str(rec[_GEO_STATE_CODE]).strip()
+    info = details.get(raw_id)
+    if not info:
+        return rec
+
+    name = info["name"]
+    country_code = info["country_code"]
+    target_type = info["target_type"]
+    canonical_name = info["canonical_name"]
+    vals = list(rec)
+    if country_code == "US" and target_type in {"State", "Province"}:
+        vals[_GEO_STATE] = name
+        vals[_GEO_STATE_CODE] = _US_STATE_CODE_BY_NAME.get(name, raw_id)
+    else:
+        vals[_GEO_STATE] = canonical_name or name
+        vals[_GEO_STATE_CODE] = raw_id
+
+    vals[_GEO_DMA] = target_type
+    return tuple(vals)
 
-        rec["dma"] = target_type
 
-    return records
+_DEVICE_ROW = operator.attrgetter(
+    "campaign.id", "segments", "segments.date",
+    *_CORE_METRICS,
+)
 
 
-def _xf_device_performance(rows: list) -> list[dict]:
-    out: list[dict] = []
+def _xf_device_performance(rows: Iterable) -> Iterator[tuple]:
+    strs = _StrMemo()
     for r in rows:
-        spend = _micros(r.metrics.cost_micros)
-        convs = float(r.metrics.conversions)
-        clicks = int(r.metrics.clicks)
-        device = _lookup(_DEVICE_MAP, r.segments.device, "Other")
-        out.append(
-            {
-                "id": _make_id(r.campaign.id, device),
-                "date": str(r.segments.date),
-                "campaign_id": str(r.campaign.id),
-                "device": device,
-                "spend": spend,
-                "impressions": int(r.metrics.impressions),
-                "clicks": clicks,
-                "conversions": convs,
-                "conversion_value": float(r.metrics.conversions_value),
-                "ctr": float(r.metrics.ctr),
-                "cpc": _micros(r.metrics.average_cpc),
-                "cpa": _div(spend, convs),
-                "roas": _div(float(r.metrics.conversions_value), spend),
-                "conv_rate": _div(convs, clicks),
-            }
+        (
+            cid, seg, date,
+            cost, impressions, clicks, convs, conv_val, ctr, cpc,
+        ) = _DEVICE_ROW(r)
+        device = _lookup(_DEVICE_MAP, seg, "device", "Other")
+        yield (
+            _make_id(cid, device),
+            strs[date],
+            strs[cid],
+            device,
+            _micros(cost),
+            int(impressions),
+            int(clicks),
+            float(convs),
+            float(conv_val),
+            float(ctr),
+            _micros(cpc),
         )
-    return out
 
 
-def _xf_hourly_performance(rows: list) -> list[dict]:
-    out: list[dict] = []
+_HOURLY_ROW = operator.attrgetter(
+    "campaign.id", "segments", "segments.date", "segments.hour",
+    "metrics.cost_micros", "metrics.impressions", "metrics.clicks",
+    "metrics.conversions", "metrics.conversions_value",
+)
+
+
+def _xf_hourly_performance(rows: Iterable) -> Iterator[tuple]:
+    strs = _StrMemo()
     for r in rows:
-        hour = int(r.segments.hour)
-        dow = _lookup(_DOW_MAP, r.segments.day_of_week, _ename(r.segments.day_of_week))
-        out.append(
-            {
-                "id": _make_id(r.campaign.id, hour, dow),
-                "date": str(r.segments.date),
-                "campaign_id": str(r.campaign.id),
-                "hour": hour,
-                "day_of_week": dow,
-                "spend": _micros(r.metrics.cost_micros),
-                "impressions": int(r.metrics.impressions),
-                "clicks": int(r.metrics.clicks),
-                "conversions": float(r.metrics.conversions),
-                "conversion_value": float(r.metrics.conversions_value),
-            }
+        (
+            cid, seg, date, hour,
+            cost, impressions, clicks, convs, conv_val,
+        ) = _HOURLY_ROW(r)
+        hour = int(hour)
+        dow = _lookup(_DOW_MAP, seg, "day_of_week") or _ename(seg, "day_of_week")
+        yield (
+            _make_id(cid, hour, dow),
+            strs[date],
+            strs[cid],
+            hour,
+            dow,
+            _micros(cost),
+            int(impressions),
+            int(clicks),
+            float(convs),
+            float(conv_val),
         )
-    return out
 
 
-def _xf_auction_insights(rows: list) -> list[dict]:
-    out: list[dict] = []
+_AUCTION_ROW = operator.attrgetter(
+    "campaign.id", "segments.date",
+    "metrics.search_impression_share",
+    "metrics.search_top_impression_share",
+    "metrics.search_absolute_top_impression_share",
+)
+
+
+def _xf_auction_insights(rows: Iterable) -> Iterator[tuple]:
+    strs = _StrMemo()
     for r in rows:
-        out.append(
-            {
-                "id": _make_id(r.campaign.id, "self"),
-                "date": str(r.segments.date),
-                "campaign_id": str(r.campaign.id),
-                "competitor": "You",
-                "impression_share": float(r.metrics.search_impression_share or 0),
-                "overlap_rate": None,
-                "position_above_rate": None,
-                "top_of_page_rate": float(r.metrics.search_top_impression_share or 0),
-                "outranking_share": float(r.metrics.search_absolute_top_impression_share or 0),
-            }
+        cid, date, imp_share, top_share, abs_top_share = _AUCTION_ROW(r)
+        yield (
+            _make_id(cid, "self"),
+            strs[date],
+            strs[cid],
+            "You",
+            float(imp_share or 0),
+            None,  # overlap_rate
+            None,  # position_above_rate
+            float(top_share or 0),
+            float(abs_top_share or 0),
         )
-    return out
 
 
-def _xf_quality_score_snapshots(rows: list) -> list[dict]:
-    out: list[dict] = []
+_QUALITY_SCORE_ROW = operator.attrgetter(
+    "ad_group_criterion.criterion_id", "ad_group_criterion.keyword.text",
+    "ad_group_criterion.quality_info",
+    "campaign.id", "campaign.name", "segments.date", "metrics.cost_micros",
+)
+
+
+def _xf_quality_score_snapshots(rows: Iterable) -> Iterator[tuple]:
+    strs = _StrMemo()
     for r in rows:
-        out.append(
-            {
-                "id": str(r.ad_group_criterion.criterion_id),
-                "date": str(r.segments.date),
-                "keyword_id": str(r.ad_group_criterion.criterion_id),
-                "keyword": str(r.ad_group_criterion.keyword.text),
-                "campaign_id": str(r.campaign.id),
-                "product": infer_product(r.campaign.name),
-                "quality_score": int(r.ad_group_criterion.quality_info.quality_score or 0),
-                "expected_ctr": _lookup(_QS_RATING, r.ad_group_criterion.quality_info.search_predicted_ctr),
-                "ad_relevance": _lookup(_QS_RATING, r.ad_group_criterion.quality_info.creative_quality_score),
-                "landing_page_experience": _lookup(
-                    _QS_RATING, r.ad_group_criterion.quality_info.post_click_quality_score
-                ),
-                "spend": _micros(r.metrics.cost_micros),
-            }
+        criterion_id, text, qi, cid, cname, date, cost = _QUALITY_SCORE_ROW(r)
+        criterion_id = str(criterion_id)
+        yield (
+            criterion_id,
+            strs[date],
+            criterion_id,
+            str(text),
+            strs[cid],
+            infer_product(strs[cname]),
+            int(qi.quality_score or 0),
+            _lookup(_QS_RATING, qi, "search_predicted_ctr"),
+            _lookup(_QS_RATING, qi, "creative_quality_score"),
+            _lookup(_QS_RATING, qi, "post_click_quality_score"),
+            _micros(cost),
         )
-    return out
 
 
-def _xf_conversion_actions(rows: list) -> list[dict]:
-    out: list[dict] = []
+_CONVERSION_ROW = operator.attrgetter(
+    "campaign.id", "campaign.name", "segments", "segments.date",
+    "segments.conversion_action_name",
+    "metrics.conversions", "metrics.conversions_value",
+)
+
+
+def _xf_conversion_actions(rows: Iterable) -> Iterator[tuple]:
+    strs = _StrMemo()
     for r in rows:
-        conv_type = str(r.segments.conversion_action_name or "")
+        cid, cname, seg, date, action_name, convs, conv_val = _CONVERSION_ROW(r)
+        conv_type = str(action_name or "")
         category = ""
         try:
-            category = _ename(r.segments.conversion_action_category)
+            category = _ename(seg, "conversion_action_category")
         except Exception:
             pass
-        out.append(
-            {
-                "id": _make_id(r.campaign.id, conv_type),
-                "date": str(r.segments.date),
-                "campaign_id": str(r.campaign.id),
-                "product": infer_product(r.campaign.name),
-                "conversion_type": conv_type,
-                "conversions": float(r.metrics.conversions),
-                "conversion_value": float(r.metrics.conversions_value),
-                "attribution": category,
-            }
+        yield (
+            _make_id(cid, conv_type),
+            strs[date],
+            strs[cid],
+            infer_product(strs[cname]),
+            conv_type,
+            float(convs),
+            float(conv_val),
+            category,
         )
-    return out
 
 
-def _xf_landing_pages(rows: list) -> list[dict]:
-    out: list[dict] = []
+_LANDING_PAGE_ROW = operator.attrgetter(
+    "landing_page_view.unexpanded_final_url",
+    "segments.date", "metrics.clicks", "metrics.conversions", "metrics.conversions_value",
+)
+
+
+def _xf_landing_pages(rows: Iterable) -> Iterator[tuple]:
+    strs = _StrMemo()
     for r in rows:
-        url = str(r.landing_page_view.unexpanded_final_url or "")
+        url, date, clicks, convs, conv_val = _LANDING_PAGE_ROW(r)
+        url = str(url or "")
         if not url:
             continue
-        clicks = int(r.metrics.clicks)
-        convs = float(r.metrics.conversions)
-        out.append(
-            {
-                "id": _make_id(url),
-                "date": str(r.segments.date),
-                "url": url,
-                "sessions": clicks,  # approximation: sessions ≈ clicks
-                "bounce_rate": None,  # not available from Google Ads; pull from GA4
-                "conversion_rate": _div(convs, clicks),
-                "conversions": convs,
-                "conversion_value": float(r.metrics.conversions_value),
-                "mobile_conv_rate": None,  # requires device-segmented landing page query
-                "desktop_conv_rate": None,
-            }
+        clicks = int(clicks)
+        convs = float(convs)
+        yield (
+            _make_id(url),
+            strs[date],
+            url,
+            clicks,  # sessions: approximation, sessions ≈ clicks
+            None,  # bounce_rate: not available from Google Ads; pull from GA4
+            _div(convs, clicks),
+            convs,
+            float(conv_val),
+            None,  # mobile_conv_rate: requires device-segmented landing page query
+            None,  # desktop_conv_rate
         )
-    return out
 
 
 # ---------------------------------------------------------------------------
@@ -852,13 +1218,68 @@ ENTITIES: dict[str, dict] = {
 # ---------------------------------------------------------------------------
 
 
-def _run_gaql(ga: GoogleAdsClient, query: str) -> list:
-    service = ga.get_service("GoogleAdsService")
-    rows: list = []
-    stream = service.search_stream(customer_id=CUSTOMER_ID, query=query)
-    for batch in stream:
-        rows.extend(batch.results)
-    return rows
+def _gaql_status(exc: Exception) -> str:
+    """gRPC status name of a Google Ads or bare transport error."""
+    call = exc.error if isinstance(exc, GoogleAdsException) else exc
+    try:
+        return call.code().name
+    except AttributeError:
+        return ""
+
+
+def _gaql_retryable(exc: Exception) -> bool:
+    """Quota, internal and transport errors are transient; auth, permission
+    and query errors are fatal."""
+    return _gaql_status(exc) in _GAQL_RETRYABLE
+
+
+def _backoff(base: float, attempt: int) -> float:
+    """Exponential delay for ``attempt`` (1-based), jittered so concurrent
+    workers that failed together do not retry in lockstep."""
+    return base * 2 ** (attempt - 1) * random.uniform(0.5, 1.0)
+
+
+@functools.lru_cache(maxsize=1)
+def _ga_service(ga: GoogleAdsClient) -> Any:
+    # get_service() builds a new stub and gRPC channel on every call; one
+    # shared service lets all report threads multiplex over one channel.
+    return ga.get_service("GoogleAdsService")
+
+
+def _run_gaql(ga: GoogleAdsClient, query: str, stats: dict[str, int] | None = None) -> Iterator:
+    """Stream result rows as Google Ads returns them.
+
+    Transient failures are retried only until the first row has been
+    yielded; after that the consumer has already acted on partial output.
+    When ``stats`` is given, ``stats["rows"]`` counts rows as batches
+    arrive, so callers get the API row count without a separate pass.
+    """
+    service = _ga_service(ga)
+    attempt = 1
+    while True:
+        yielded = False
+        try:
+            stream = service.search_stream(customer_id=CUSTOMER_ID, query=query)
+            for batch in stream:
+                if batch.results:
+                    yielded = True
+                    if stats is not None:
+                        stats["rows"] = stats.get("rows", 0) + len(batch.results)
+                    yield from batch.results
+            return
+        except (GoogleAdsException, grpc.RpcError) as exc:
+            if yielded or attempt >= GAQL_MAX_ATTEMPTS or not _gaql_retryable(exc):
+                raise
+            delay = _backoff(GAQL_RETRY_BASE_SECONDS, attempt)
+            log.warning(
+                "  GAQL %s (attempt %d/%d), retrying in %.1fs",
+                _gaql_status(exc),
+                attempt,
+                GAQL_MAX_ATTEMPTS,
+                delay,
+            )
+            time.sleep(delay)
+            attempt += 1
 
 
 # ---------------------------------------------------------------------------
@@ -866,24 +1287,297 @@ def _run_gaql(ga: GoogleAdsClient, query: str) -> list:
 # ---------------------------------------------------------------------------
 
 
-def _dedupe(records: list[dict]) -> list[dict]:
-    """Keep last record per (id, date) to avoid Postgres upsert conflict."""
-    seen: dict[tuple[str, str], int] = {}
-    for idx, rec in enumerate(records):
-        seen[(rec["id"], rec["date"])] = idx
-    return [records[i] for i in sorted(seen.values())]
+def _dedupe_chunks(
+    records: Iterable[tuple], size: int, seen: set[tuple] | None = None
+) -> Iterator[dict[tuple, tuple]]:
+    """Group records into chunks of up to ``size`` distinct (id, date) keys.
 
+    A key seen again while its chunk is still filling replaces the earlier
+    record (last wins), so no chunk carries a key twice — Postgres rejects
+    that — and nearby duplicates are never sent at all. Each chunk is the
+    insertion-ordered ``{(id, date): record}`` dict itself, so callers get
+    its key set for free.
 
-def _upsert(supa: Client, table: str, records: list[dict]) -> int:
-    if not records:
-        return 0
-    records = _dedupe(records)
-    total = 0
-    for i in range(0, len(records), BATCH_SIZE):
-        chunk = records[i : i + BATCH_SIZE]
-        supa.table(table).upsert(chunk, on_conflict="id,date").execute()
-        total += len(chunk)
-    return total
+    If ``seen`` is given, every emitted key is added to it, so its size is
+    the number of distinct rows written even when a key recurs across
+    chunks.
+    """
+    window: dict[tuple, tuple] = {}
+    for rec in records:
+        window[rec[:2]] = rec
+        if len(window) >= size:
+            if seen is not None:
+                seen.update(window)
+            yield window
+            window = {}
+    if window:
+        if seen is not None:
+            seen.update(window)
+        yield window
+
+
+if orjson is not None:
+    _dumps = orjson.dumps
+else:
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+_UPSERT_HEADERS = {
+    "Content-Type": "application/json",
+    "Prefer": "resolution=merge-duplicates,return=minimal",
+}
+
+
+def _post_chunk(supa: Client, table: str, chunk: list[tuple]) -> int:
+    # Same request supa.table(table).upsert(...) makes, but the body is
+    # pre-encoded (orjson when available) and nothing is echoed back.
+    # Records stay compact tuples until here; the per-row dicts PostgREST's
+    # JSON shape needs exist only for the duration of the encode.
+    # Rate limiting (429), gateway/server errors and dropped connections are
+    # retried with backoff.
+    columns = SCHEMA[table]
+    body = _dumps([dict(zip(columns, rec)) for rec in chunk])
+    if len(body) > UPSERT_MAX_BODY_BYTES and len(chunk) > 1:
+        half = len(chunk) // 2
+        return _post_chunk(supa, table, chunk[:half]) + _post_chunk(supa, table, chunk[half:])
+    attempt = 1
+    while True:
+        try:
+            resp = supa.postgrest.session.post(
+                f"/{table}",
+                params={"on_conflict": "id,date"},
+                content=body,
+                headers=_UPSERT_HEADERS,
+            )
+        except httpx.TransportError as exc:
+            if attempt >= UPSERT_MAX_ATTEMPTS:
+                raise
+            reason = type(exc).__name__
+        else:
+            status = resp.status_code
+            if status < 400:
+                return len(chunk)
+            if attempt >= UPSERT_MAX_ATTEMPTS or status not in _UPSERT_RETRYABLE:
+                raise RuntimeError(f"upsert into {table} failed ({status}): {resp.text}")
+            reason = f"HTTP {status}"
+        delay = _backoff(UPSERT_RETRY_BASE_SECONDS, attempt)
+        log.warning(
+            "  [%s] upsert %s (attempt %d/%d), retrying in %.1fs",
+            table,
+            reason,
+            attempt,
+            UPSERT_MAX_ATTEMPTS,
+            delay,
+        )
+        time.sleep(delay)
+        attempt += 1
+
+
+def _upsert(
+    supa: Client, table: str, records: Iterable[tuple], writers: ThreadPoolExecutor
+) -> int:
+    """Upsert records in chunks of BATCH_SIZES[table] keys as they arrive.
+
+    Duplicates collapse while a chunk fills (see _dedupe_chunks); a key
+    repeated after its chunk was sent is simply written again, so the last
+    record still wins.
+
+    PostgREST requests run on the shared ``writers`` pool, so fetching and
+    transforming carry on while chunks are in flight. Up to
+    UPSERT_CHUNKS_PER_TABLE chunks of one table are sent concurrently; a
+    chunk that shares a key with one still in flight waits for it, so the
+    later record always lands last. Returns the number of distinct rows.
+    """
+    if _pg_enabled():
+        return _pg_upsert(table, records)
+
+    seen: set[tuple] = set()
+    in_flight: deque[tuple[Future[int], KeysView]] = deque()
+    for chunk in _dedupe_chunks(records, BATCH_SIZES.get(table, BATCH_SIZE), seen):
+        keys = chunk.keys()
+        # Wait on the oldest chunks until there is room and nothing still in
+        # flight shares a key with this one.
+        while in_flight and (
+            len(in_flight) >= UPSERT_CHUNKS_PER_TABLE
+            or any(not k.isdisjoint(keys) for _, k in in_flight)
+        ):
+            in_flight.popleft()[0].result()
+        rows = list(chunk.values())
+        in_flight.append((writers.submit(_post_chunk, supa, table, rows), keys))
+    while in_flight:
+        in_flight.popleft()[0].result()
+    return len(seen)
+
+
+# ---------------------------------------------------------------------------
+# Postgres bulk load (COPY → temp table → INSERT … ON CONFLICT)
+# ---------------------------------------------------------------------------
+
+
+def _pg_enabled() -> bool:
+    return bool(SUPABASE_DB_URL) and psycopg is not None
+
+
+_pg_pool: Any = None
+_pg_pool_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def _pg_connection() -> Iterator[Any]:
+    """Autocommit connection, from a pool shared by all table writers.
+
+    The pool is sized to the report workers, so a run opens (and TLS
+    handshakes) at most GAQL_CONCURRENCY connections rather than one per
+    table. Like the API clients it lives for the process, so repeated
+    sync() calls reuse it; it is closed at exit. Without psycopg_pool each
+    call connects afresh.
+    """
+    global _pg_pool
+    if ConnectionPool is None:
+        with psycopg.connect(SUPABASE_DB_URL, autocommit=True) as conn:
+            yield conn
+        return
+    with _pg_pool_lock:
+        if _pg_pool is None:
+            _pg_pool = ConnectionPool(
+                SUPABASE_DB_URL,
+                min_size=1,
+                max_size=GAQL_CONCURRENCY,
+                kwargs={"autocommit": True},
+                open=True,
+            )
+    with _pg_pool.connection() as conn:
+        yield conn
+
+
+@atexit.register
+def _close_pg_pool() -> None:
+    global _pg_pool
+    with _pg_pool_lock:
+        if _pg_pool is not None:
+            _pg_pool.close()
+            _pg_pool = None
+
+
+_PREFETCH_DONE = object()
+
+
+def _prefetch(items: Iterable, depth: int) -> Iterator:
+    """Iterate ``items`` on a background thread, at most ``depth`` ahead.
+
+    The producer (GAQL stream → transform → batching) keeps running while
+    the caller blocks on the database; the bounded queue is the
+    backpressure. Producer exceptions re-raise in the caller. If the caller
+    stops early, the producer exits at its next put.
+    """
+    q: queue.Queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce() -> None:
+        try:
+            for item in items:
+                if not put((item, None)):
+                    return
+        except BaseException as exc:
+            put((_PREFETCH_DONE, exc))
+        else:
+            put((_PREFETCH_DONE, None))
+
+    threading.Thread(target=produce, name="prefetch", daemon=True).start()
+    try:
+        while True:
+            item, exc = q.get()
+            if item is _PREFETCH_DONE:
+                if exc is not None:
+                    raise exc
+                return
+            yield item
+    finally:
+        stop.set()
+
+
+def _as_jsonb(rec: tuple, json_idx: list[int]) -> list:
+    rec = list(rec)
+    for i in json_idx:
+        rec[i] = Jsonb(rec[i])
+    return rec
+
+
+def _pg_upsert(table: str, records: Iterable[tuple]) -> int:
+    """Bulk-load records over a direct Postgres connection.
+
+    Each COPY_BATCH_SIZE batch is COPYed into a transaction-scoped temp
+    table and folded into the target with one MERGE (Postgres 15+, which
+    Supabase runs) or INSERT … ON CONFLICT on older servers, skipping
+    PostgREST's per-request JSON handling entirely. The next batches are
+    fetched and built while one is being merged (see _prefetch).
+    """
+    columns = SCHEMA[table]
+    target = sql.Identifier(table)
+    staging = sql.Identifier(f"_stage_{table}")
+    cols = sql.SQL(", ").join(map(sql.Identifier, columns))
+    updated = [sql.Identifier(c) for c in columns[2:]]
+    create_stage = sql.SQL(
+        "CREATE TEMP TABLE {s} ON COMMIT DROP AS SELECT {c} FROM {t} WITH NO DATA"
+    ).format(s=staging, c=cols, t=target)
+    copy_stage = sql.SQL("COPY {s} ({c}) FROM STDIN").format(s=staging, c=cols)
+    merge = sql.SQL(
+        "MERGE INTO {t} AS t USING {s} AS s ON t.id = s.id AND t.date = s.date"
+        " WHEN MATCHED THEN UPDATE SET {u}"
+        " WHEN NOT MATCHED THEN INSERT ({c}) VALUES ({v})"
+    ).format(
+        t=target,
+        s=staging,
+        u=sql.SQL(", ").join(sql.SQL("{0} = s.{0}").format(c) for c in updated),
+        c=cols,
+        v=sql.SQL(", ").join(sql.SQL("s.{}").format(sql.Identifier(c)) for c in columns),
+    )
+    insert_on_conflict = sql.SQL(
+        "INSERT INTO {t} ({c}) SELECT {c} FROM {s} ON CONFLICT (id, date) DO UPDATE SET {u}"
+    ).format(
+        t=target,
+        c=cols,
+        s=staging,
+        u=sql.SQL(", ").join(sql.SQL("{0} = EXCLUDED.{0}").format(c) for c in updated),
+    )
+
+    seen: set[tuple] = set()
+    with _pg_connection() as conn:
+        # List values (ad headlines/descriptions) must be sent as JSON when
+        # the column is json/jsonb rather than a Postgres array.
+        with conn.cursor() as cur:
+            cur.execute(sql.SQL("SELECT {c} FROM {t} LIMIT 0").format(c=cols, t=target))
+            json_oids = {conn.adapters.types["json"].oid, conn.adapters.types["jsonb"].oid}
+            json_idx = [i for i, d in enumerate(cur.description) if d.type_code in json_oids]
+        # MERGE has no ON CONFLICT fallback: a concurrent insert of the same
+        # key would fail the batch. It is safe because each table has one
+        # writer per run and runs never overlap (the workflow's concurrency
+        # group). Don't run the ETL by hand alongside the scheduled job.
+        fold = merge if conn.info.server_version >= 150000 else insert_on_conflict
+
+        chunks = _dedupe_chunks(records, COPY_BATCH_SIZE, seen)
+        for chunk in _prefetch(chunks, COPY_PREFETCH_BATCHES):
+            with conn.transaction(), conn.cursor() as cur:
+                cur.execute(create_stage)
+                rows: Iterable = chunk.values()
+                if json_idx:
+                    rows = (_as_jsonb(rec, json_idx) for rec in rows)
+                with cur.copy(copy_stage) as copy:
+                    for rec in rows:
+                        copy.write_row(rec)
+                cur.execute(fold)
+    return len(seen)
 
 
 # ---------------------------------------------------------------------------
@@ -898,48 +1592,101 @@ def _date_condition(date_from: str, date_to: str) -> str:
     return f"segments.date BETWEEN '{date_from}' AND '{date_to}'"
 
 
+def _sync_entity(
+    ga: GoogleAdsClient,
+    supa: Client,
+    writers: ThreadPoolExecutor,
+    name: str,
+    query: str,
+    transform: Callable[[Iterable], Iterator[tuple]],
+) -> int:
+    """Stream one report from Google Ads through its transform into Supabase."""
+    log.info("  [%s] querying Google Ads …", name)
+    started = time.monotonic()
+    stats: dict[str, int] = {}
+    records = transform(_run_gaql(ga, query, stats))
+    if name == "geo_performance":
+        records = _enrich_geo_records(ga, records)
+
+    n = _upsert(supa, name, records, writers)
+    log.info(
+        "  [%s] %d API rows → upserted %d rows in %.1fs",
+        name,
+        stats.get("rows", 0),
+        n,
+        time.monotonic() - started,
+    )
+    return n
+
+
 def sync(date_from: str | None = None, date_to: str | None = None) -> None:
-    yesterday = (datetime.now(timezone.utc) - timedelta(days=1)).strftime("%Y-%m-%d")
+    started_at = datetime.now(timezone.utc)
+    yesterday = (started_at - timedelta(days=1)).strftime("%Y-%m-%d")
     d_from = date_from or yesterday
     d_to = date_to or d_from
     date_cond = _date_condition(d_from, d_to)
+    # The date window is fixed for the run, so every query is rendered once.
+    prepared = {
+        name: (cfg["query"].format(date_condition=date_cond), cfg["transform"])
+        for name, cfg in ENTITIES.items()
+    }
 
     log.info("Guardian ETL: syncing %s → %s", d_from, d_to)
+    if SUPABASE_DB_URL and psycopg is None:
+        log.warning("SUPABASE_DB_URL is set but psycopg is not installed; using PostgREST")
+    if _pg_enabled():
+        log.info("Loading via direct Postgres COPY")
+    elif orjson is None:
+        log.info("orjson is not installed; encoding upserts with stdlib json")
+    if ID_HASH != "sha256":
+        log.info("Row IDs hashed with %s", ID_HASH)
 
     ga = _ga_client()
     supa = _supa_client()
 
     sync_entry = {
-        "started_at": datetime.now(timezone.utc).isoformat(),
+        "started_at": started_at.isoformat(),
         "status": "running",
         "records_synced": 0,
         "error_message": None,
     }
-    sync_res = supa.table("sync_log").insert(sync_entry).execute()
-    sync_id = sync_res.data[0]["id"] if sync_res.data else None
 
     total_records = 0
     errors: list[str] = []
 
-    for name, cfg in ENTITIES.items():
-        try:
-            query = cfg["query"].format(date_condition=date_cond)
-            log.info("  [%s] querying Google Ads …", name)
-            rows = _run_gaql(ga, query)
-            log.info("  [%s] %d API rows", name, len(rows))
-
-            records = cfg["transform"](rows)
-            if name == "geo_performance":
-                records = _enrich_geo_records(ga, records)
-            log.info("  [%s] %d records → Supabase", name, len(records))
-
-            n = _upsert(supa, name, records)
-            total_records += n
-            log.info("  [%s] upserted %d rows", name, n)
-        except Exception as exc:
-            msg = f"{name}: {exc}"
-            log.error("  [%s] FAILED — %s", name, exc, exc_info=True)
-            errors.append(msg)
+    # Each report streams fetch → transform → upsert in its own worker, so
+    # memory stays O(BATCH_SIZE) per report and writes start immediately.
+    # Writes from every report share one bounded pool of PostgREST requests.
+    with (
+        ThreadPoolExecutor(min(GAQL_CONCURRENCY, len(prepared)), thread_name_prefix="report") as pool,
+        ThreadPoolExecutor(max_workers=UPSERT_CONCURRENCY, thread_name_prefix="upsert") as writers,
+    ):
+        # The sync_log row is written alongside the reports instead of ahead
+        # of them; its id is only needed for the final update.
+        log_insert = writers.submit(lambda: supa.table("sync_log").insert(sync_entry).execute())
+        futures = {
+            pool.submit(_sync_entity, ga, supa, writers, name, query, transform): name
+            for name, (query, transform) in prepared.items()
+        }
+        # Failures are reported as soon as they happen, not behind a slower
+        # report earlier in the registry.
+        failed: dict[str, str] = {}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                total_records += future.result()
+            except Exception as exc:
+                log.error("  [%s] FAILED — %s", name, exc, exc_info=True)
+                failed[name] = f"{name}: {exc}"
+        errors.extend(failed[name] for name in ENTITIES if name in failed)
+
+    sync_id = None
+    try:
+        sync_res = log_insert.result()
+        sync_id = sync_res.data[0]["id"] if sync_res.data else None
+    except Exception as exc:
+        log.error("  [sync_log] FAILED — %s", exc)
+        errors.append(f"sync_log: {exc}")
 
     # Finalise sync_log entry
     if sync_id:
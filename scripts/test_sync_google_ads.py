@@ -0,0 +1,216 @@
+"""Offline checks for scripts/sync_google_ads.py.
+
+Run with ``python -m pytest scripts``. No credentials or network are
+needed: the Google Ads, Supabase, gRPC and httpx modules the ETL imports
+are replaced with bare stubs when they are not installed.
+"""
+
+import importlib
+import importlib.util
+import json
+import random
+import sys
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+
+def _ensure_module(name: str, **attrs: object) -> None:
+    """Import ``name``, or register a stub module (and parents) with ``attrs``."""
+    try:
+        importlib.import_module(name)
+        return
+    except ImportError:
+        pass
+    parts = name.split(".")
+    for i in range(1, len(parts) + 1):
+        qualname = ".".join(parts[:i])
+        if qualname not in sys.modules:
+            mod = types.ModuleType(qualname)
+            mod.__path__ = []
+            sys.modules[qualname] = mod
+            if i > 1:
+                setattr(sys.modules[".".join(parts[: i - 1])], parts[i - 1], mod)
+    for key, val in attrs.items():
+        setattr(sys.modules[name], key, val)
+
+
+_ensure_module("google.ads.googleads.client", GoogleAdsClient=type("GoogleAdsClient", (), {}))
+_ensure_module(
+    "google.ads.googleads.errors",
+    GoogleAdsException=type("GoogleAdsException", (Exception,), {}),
+)
+_ensure_module("supabase", create_client=lambda *a, **kw: None, Client=object)
+_ensure_module("grpc", RpcError=type("RpcError", (Exception,), {}))
+_ensure_module("httpx", TransportError=type("TransportError", (Exception,), {}))
+
+_spec = importlib.util.spec_from_file_location(
+    "sync_google_ads", Path(__file__).with_name("sync_google_ads.py")
+)
+etl = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(etl)
+
+
+# ---------------------------------------------------------------------------
+# Campaign-name classification — parity with the original keyword lists
+# ---------------------------------------------------------------------------
+
+
+def _baseline_product(text: str) -> str:
+    t = (text or "").lower()
+    if any(k in t for k in ("termlife", "term life", "term-life", "life insurance")):
+        return "Term Life"
+    if "dental" in t:
+        return "Dental Network"
+    if any(k in t for k in ("disability", "idi")):
+        return "Disability"
+    if any(k in t for k in ("annuity", "annuities", "rila", "retirement")):
+        return "Annuities"
+    if any(k in t for k in ("recruit", "credential", "join", "provider")):
+        return "Join Our Network"
+    return "Other"
+
+
+def _baseline_intent(text: str) -> str:
+    t = (text or "").lower()
+    has_nonbrand = any(k in t for k in ("nonbrand", "non-brand", "nonbranded", "non-branded"))
+    if "google_brand" in t or t.startswith("google_brand"):
+        return "Brand"
+    if not has_nonbrand and ("-brand-" in t or "-branded" in t or t.endswith("-branded")):
+        return "Brand"
+    if any(k in t for k in ("group", "employer", "worksite", "abm-")):
+        return "Group"
+    if any(k in t for k in ("leadgen", "conversion", "quote", "quotes")):
+        return "Nonbrand Lead Gen"
+    return "Education/Midfunnel"
+
+
+_NAME_TOKENS = (
+    "GGL", "google", "google_brand", "Brand", "brand", "branded", "non", "nonbrand",
+    "Non-Brand", "nonbranded", "TermLife", "term life", "term-life", "Life Insurance",
+    "life", "Dental", "dent", "Disability", "IDI", "id", "Annuity", "annuities", "RILA",
+    "Retirement", "Recruit", "Credentialing", "Join", "Provider", "Group", "Employer",
+    "Worksite", "ABM", "abm-", "LeadGen", "Conversion", "Quote", "Quotes", "Midfunnel",
+    "Education", "AlwaysOn", "Traffic", "Awareness", "US", "2026", "",
+)
+_NAME_SEPARATORS = ("", "-", "_", " ", "|", "--")
+
+
+def _generated_names(count: int, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    names = [None, "", "google_brand", "x-branded", "non-branded-brand-x"]
+    for _ in range(count):
+        tokens = rng.choices(_NAME_TOKENS, k=rng.randint(1, 6))
+        names.append(rng.choice(_NAME_SEPARATORS).join(tokens))
+    return names
+
+
+def test_campaign_classification_matches_baseline() -> None:
+    for name in _generated_names(20_000):
+        assert etl.infer_product(name) == _baseline_product(name), name
+        assert etl.infer_intent_bucket(name) == _baseline_intent(name), name
+
+
+# ---------------------------------------------------------------------------
+# PostgREST upserts — last write wins across concurrent chunks
+# ---------------------------------------------------------------------------
+
+
+class _FakeSession:
+    """Stand-in for supa.postgrest.session that applies upserts like PostgREST.
+
+    Each request sleeps a random moment before its rows land, so chunks in
+    flight together complete out of order.
+    """
+
+    def __init__(self, seed: int) -> None:
+        self.rows: dict[tuple, dict] = {}
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+
+    def post(self, path, params=None, content=None, headers=None):
+        with self._lock:
+            delay = self._rng.uniform(0, 0.005)
+        time.sleep(delay)
+        with self._lock:
+            for row in json.loads(content):
+                self.rows[(row["id"], row["date"])] = row
+        return types.SimpleNamespace(status_code=201, text="")
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_upsert_last_write_wins_across_concurrent_chunks(monkeypatch, seed: int) -> None:
+    table = "campaigns"
+    width = len(etl.SCHEMA[table])
+    monkeypatch.setattr(etl, "SUPABASE_DB_URL", "")
+    monkeypatch.setitem(etl.BATCH_SIZES, table, 7)
+
+    rng = random.Random(seed)
+    keys = [(f"c{i}", "2026-02-01") for i in range(40)]
+    records = [(*rng.choice(keys), *[seq] * (width - 2)) for seq in range(600)]
+    expected = {rec[:2]: rec for rec in records}
+
+    session = _FakeSession(seed)
+    supa = types.SimpleNamespace(postgrest=types.SimpleNamespace(session=session))
+    with ThreadPoolExecutor(max_workers=etl.UPSERT_CONCURRENCY) as writers:
+        written = etl._upsert(supa, table, iter(records), writers)
+
+    assert written == len(expected)
+    assert {key: tuple(row.values()) for key, row in session.rows.items()} == expected
+
+
+# ---------------------------------------------------------------------------
+# COPY batch prefetch
+# ---------------------------------------------------------------------------
+
+
+def _prefetch_threads() -> list[threading.Thread]:
+    return [t for t in threading.enumerate() if t.name == "prefetch"]
+
+
+def _wait_for_prefetch_exit(timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while _prefetch_threads() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not _prefetch_threads()
+
+
+def test_prefetch_yields_items_in_order() -> None:
+    assert list(etl._prefetch(iter(range(50)), 2)) == list(range(50))
+    _wait_for_prefetch_exit()
+
+
+def test_prefetch_reraises_producer_errors() -> None:
+    def batches():
+        yield 1
+        yield 2
+        raise ValueError("stream reset")
+
+    seen = []
+    with pytest.raises(ValueError, match="stream reset"):
+        for item in etl._prefetch(batches(), 1):
+            seen.append(item)
+    assert seen == [1, 2]
+    _wait_for_prefetch_exit()
+
+
+def test_prefetch_stops_producer_when_caller_quits() -> None:
+    produced = []
+
+    def endless():
+        n = 0
+        while True:
+            n += 1
+            produced.append(n)
+            yield n
+
+    it = etl._prefetch(endless(), 2)
+    assert [next(it), next(it)] == [1, 2]
+    it.close()
+    _wait_for_prefetch_exit()
+    # At most the queue's depth plus the item being put were built ahead.
+    assert len(produced) <= 2 + 2 + 1